@@ -5,33 +5,95 @@ author_url: https://github.com/ay4t
 funding_url: https://github.com/open-webui
 version: 0.1.0
 description: Scrape websites found in the query using Jina service
+requirements: aiohttp, cachetools
 """
 
-import requests
+import aiohttp
+from cachetools import TTLCache
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Union, Callable, Any
+from typing import List, Dict, Optional, Union, Callable, Any, Tuple
 import asyncio
 import inspect
 import sys
 import logging
-import time
-from urllib.parse import urljoin
+import os
 import re
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
 
 class Tools:
+    # Scraped content keyed by normalized URL, shared across tool instances
+    _cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+
     def __init__(self):
         self.citation = True
-        self.base_url = "r.jina.ai/"
+        self.base_url = "https://r.jina.ai/"
         
         self.timeout = 30  
+        # Cap on concurrent requests to Jina, and retries after a 429;
+        # the semaphore is created per event loop in _get_session
+        self.max_retries = 3
+        self.concurrency = int(os.getenv("JINA_CONCURRENCY", "6"))
+        self._sem: Optional[asyncio.Semaphore] = None
         self.headers = {
             "X-No-Cache": "true",
             "X-With-Images-Summary": "true",
             "X-With-Links-Summary": "true",
         }
         # URL regex pattern
-        self.url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*'
+        self.url_pattern = r'https?://[^\s<>"\'\]]+'
+        self._url_re = re.compile(self.url_pattern)
+        # Start of the trailing Images/Links summary in Jina's output
+        self._images_marker = b"\nImages:"
+        # In-flight fetches, so concurrent scrapes of one URL share a request
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared HTTP session, creating it on first use and again
+        whenever the running event loop changes, since a session and the
+        concurrency semaphore are bound to the loop they were first used in.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            self._discard_session()
+            self._session_loop = loop
+            self._sem = asyncio.Semaphore(self.concurrency)
+        if self._session is None or self._session.closed:
+            # Every request goes to r.jina.ai, so size the pool to the semaphore
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    limit_per_host=self.concurrency,
+                    ttl_dns_cache=300,
+                ),
+            )
+        return self._session
+
+    def _discard_session(self) -> None:
+        """
+        Close the current session on its own loop if that loop is still
+        running; a session on a closed loop can only be dropped.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = None
+        if session is None or session.closed or loop is None:
+            return
+        if loop.is_running() and loop is not asyncio.get_running_loop():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session and release its pooled connections."""
+        if self._session is not None and self._session_loop is asyncio.get_running_loop():
+            session, self._session = self._session, None
+            await session.close()
+        else:
+            self._discard_session()
 
     async def jina_web_scrape(
         self, 
@@ -49,60 +111,21 @@ class Tools:
             
         emitter = EventEmitter(__event_emitter__)
         
-        # Extract URLs from query
-        urls = re.findall(self.url_pattern, query)
+        urls, skipped = self._extract_urls(query)
+        if skipped and emitter.enabled:
+            await emitter.status(f"Skipping {len(skipped)} invalid URLs: {', '.join(skipped)}")
         if not urls:
             await emitter.status("No valid URLs found in the input", "complete", True)
             return "No valid URLs found to scrape."
 
         await emitter.status(f"Found {len(urls)} URLs to scrape")
         
-        all_results = []
-        
-        for url in urls:
-            try:
-                # Validate and prepare URL
-                if not url.startswith(('http://', 'https://')):
-                    url = f'https://{url}'
-                
-                jina_url = urljoin(self.base_url, url)
-                
-                await emitter.status(f"Initiating Jina web scrape for: {url}")
-                
-                # Simulate request preparation
-                await emitter.status(f"Preparing request to Jina service for {url}...")
-                time.sleep(1)
-                
-                # Simulate API call
-                await emitter.status(f"Sending request to Jina service for {url}...")
-                time.sleep(2)
-                
-                try:
-                    # Make the actual request to Jina's service
-                    response = requests.get(jina_url, headers=self.headers, timeout=self.timeout)
-                    response.raise_for_status()
-                    
-                    await emitter.status(f"Processing response from Jina service for {url}...")
-                    
-                    # Extract content and remove Links/Buttons section
-                    content = response.text
-                    links_section_start = content.rfind("Images:")
-                    if links_section_start != -1:
-                        content = content[:links_section_start].strip()
-                    
-                    all_results.append(f"## Web Scrape Result for {url}: \n\n{content}\n\n")
-                    
-                except requests.RequestException as e:
-                    error_msg = f"Failed to scrape {url}: {str(e)}"
-                    await emitter.status(error_msg, "error", False)
-                    all_results.append(f"## Error scraping {url}: \n{error_msg}\n\n")
-                    continue
-                    
-            except Exception as e:
-                error_msg = f"Unexpected error while processing {url}: {str(e)}"
-                await emitter.status(error_msg, "error", False)
-                all_results.append(f"## Error processing {url}: \n{error_msg}\n\n")
-                continue
+        # Scrape all URLs concurrently over the shared session;
+        # each scrape folds its own errors into its result block
+        session = self._get_session()
+        results = await asyncio.gather(
+            *(self._scrape_one(session, url, emitter) for url in urls)
+        )
         
         await emitter.status(
             f"Completed scraping {len(urls)} URLs", 
@@ -111,7 +134,157 @@ class Tools:
         )
         
         # Combine all results
-        return "".join(all_results)
+        return "".join(results)
+
+    def _extract_urls(self, query: str) -> Tuple[List[str], List[str]]:
+        """
+        Extract unique URLs from the query, keeping first-seen order.
+        Returns the valid URLs and the candidates skipped as malformed.
+        """
+        urls, skipped = [], []
+        for match in self._url_re.finditer(query):
+            url = match.group()
+            # Drop trailing punctuation, keeping a ")" that closes a "(" in the URL
+            while url and url[-1] in ".,;)]'\"":
+                if url[-1] == ")" and url.count("(") >= url.count(")"):
+                    break
+                url = url[:-1]
+            try:
+                netloc = urlsplit(url).netloc
+            except ValueError:
+                # e.g. an unterminated IPv6 host such as "http://[::1"
+                skipped.append(url)
+                continue
+            if not netloc or "." not in netloc:
+                skipped.append(url)
+            else:
+                urls.append(url)
+        return list(dict.fromkeys(urls)), list(dict.fromkeys(skipped))
+
+    async def _scrape_one(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        emitter: "EventEmitter",
+    ) -> str:
+        """
+        Scrape a single URL through Jina and return its formatted result,
+        or an error block if the scrape fails.
+        """
+        # Validate and prepare URL
+        if not url.startswith(('http://', 'https://')):
+            url = f'https://{url}'
+        
+        try:
+            if emitter.enabled:
+                await emitter.status(f"Initiating Jina web scrape for: {url}")
+                await emitter.status(f"Preparing request to Jina service for {url}...")
+                await emitter.status(f"Sending request to Jina service for {url}...")
+            
+            content = await self._fetch(session, url)
+            
+            if emitter.enabled:
+                await emitter.status(f"Processing response from Jina service for {url}...")
+            
+            return f"## Web Scrape Result for {url}: \n\n{content}\n\n"
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error_msg = f"Failed to scrape {url}: {str(e)}"
+            await self._status_error(emitter, error_msg)
+            return f"## Error scraping {url}: \n{error_msg}\n\n"
+        except Exception as e:
+            error_msg = f"Unexpected error while processing {url}: {str(e)}"
+            await self._status_error(emitter, error_msg)
+            return f"## Error processing {url}: \n{error_msg}\n\n"
+
+    @staticmethod
+    async def _status_error(emitter: "EventEmitter", error_msg: str) -> None:
+        """
+        Report a per-URL error, so a failing emitter cannot escape the
+        error block that _scrape_one returns for that URL.
+        """
+        try:
+            await emitter.status(error_msg, "error", False)
+        except Exception as e:
+            logger.error(f"Failed to emit error status: {str(e)}")
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> str:
+        """
+        Fetch the Jina content for a URL, served from cache when possible.
+        Concurrent calls for the same URL wait on a single request.
+        """
+        while True:
+            content = self._cache.get(url)
+            if content is not None:
+                return content
+            
+            pending = self._inflight.get(url)
+            if pending is None:
+                break
+            # Waiting does not cancel the shared fetch, and only raises if we are cancelled
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                return pending.result()
+            # The caller that owned the fetch was cancelled; fetch it ourselves
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with self._sem:
+                    # Make the actual request to Jina's service
+                    async with session.get(self.base_url + url) as response:
+                        if response.status != 429 or attempt == self.max_retries:
+                            response.raise_for_status()
+                            content = await self._read_until_images(response)
+                            break
+                        retry_after = self._retry_after(response)
+                # Rate limited: back off, capped at the request timeout, without
+                # holding a concurrency slot other URLs could use meanwhile
+                await asyncio.sleep(min(retry_after * 2 ** attempt, self.timeout))
+            
+            self._cache[url] = content
+            future.set_result(content)
+            return content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved so an unawaited failure is not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> float:
+        """Seconds to wait as requested by a 429 response, defaulting to 1."""
+        try:
+            return max(float(response.headers.get("Retry-After", 1)), 0.0)
+        except ValueError:
+            return 1.0
+
+    async def _read_until_images(self, response: aiohttp.ClientResponse) -> str:
+        """
+        Stream the response body, stopping at the Images/Links section so the
+        trailing summaries are never downloaded.
+        """
+        buf = bytearray()
+        truncated = False
+        async for chunk in response.content.iter_chunked(8192):
+            # Rescan the tail of the previous chunk in case the marker spans both
+            search_from = max(0, len(buf) - len(self._images_marker) + 1)
+            buf.extend(chunk)
+            marker_start = buf.find(self._images_marker, search_from)
+            if marker_start != -1:
+                del buf[marker_start:]
+                truncated = True
+                response.close()
+                break
+        
+        content = buf.decode(response.charset or "utf-8", errors="replace")
+        return content.strip() if truncated else content
 
 
 @dataclass
@@ -124,6 +297,11 @@ class EventEmitter:
         if self.event_emitter is not None and not callable(self.event_emitter):
             raise ValueError("event_emitter must be callable")
 
+    @property
+    def enabled(self) -> bool:
+        """Whether emitted events go anywhere (an emitter or debug output)."""
+        return self.event_emitter is not None or self.debug
+
     def set_status_prefix(self, status_prefix: str) -> None:
         """Set a prefix for all status messages."""
         self._status_prefix = status_prefix
@@ -147,6 +325,8 @@ class EventEmitter:
         self, description: str = "Unknown state", status: str = "in_progress", done: bool = False
     ) -> None:
         """Emit a status update event."""
+        if not self.enabled:
+            return
         if self._status_prefix is not None:
             description = f"{self._status_prefix}{description}"
         await self._emit(
@@ -173,6 +353,8 @@ class EventEmitter:
 
     async def citation(self, document: str, metadata: dict, source: str) -> None:
         """Emit a citation event."""
+        if not self.enabled:
+            return
         await self._emit(
             "citation",
             {
@@ -1,11 +1,21 @@
-import requests
+"""
+title: Knowledge Base
+author: aahadr
+author_url: https://github.com/ay4t
+funding_url: https://github.com/open-webui
+version: 0.1.0
+description: Query a knowledge base server for relevant documents
+requirements: httpx, orjson
+"""
+
+import httpx
+import orjson
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Union, Callable, Any
 import asyncio
 import inspect
 import sys
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +33,11 @@ class EventEmitter:
         if self.event_emitter is not None and not callable(self.event_emitter):
             raise ValueError("event_emitter must be callable")
 
+    @property
+    def enabled(self) -> bool:
+        """Whether emitted events go anywhere (an emitter or debug output)."""
+        return self.event_emitter is not None or self.debug
+
     def set_status_prefix(self, status_prefix: str) -> None:
         """Set a prefix for all status messages."""
         self._status_prefix = status_prefix
@@ -46,6 +61,8 @@ class EventEmitter:
         self, description: str = "Unknown state", status: str = "in_progress", done: bool = False
     ) -> None:
         """Emit a status update event."""
+        if not self.enabled:
+            return
         if self._status_prefix is not None:
             description = f"{self._status_prefix}{description}"
         await self._emit(
@@ -63,6 +80,8 @@ class EventEmitter:
 
     async def citation(self, document: str, metadata: dict, source: str) -> None:
         """Emit a citation event."""
+        if not self.enabled:
+            return
         await self._emit(
             "citation",
             {
@@ -73,13 +92,142 @@ class EventEmitter:
         )
 
 class Tools:
-    def __init__(self, base_url: str = "http://0.0.0.0:8082", token: str = "your-secret-token"):
+    def __init__(
+        self,
+        base_url: str = "http://0.0.0.0:8082",
+        token: str = "your-secret-token",
+        batch_window_ms: int = 0
+    ):
         self.base_url = base_url.rstrip('/')
         self.token = token
         self.headers = {
             "token": self.token,
             "Content-Type": "application/json"
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # When > 0, queries arriving within this window are sent as one batch
+        self.batch_window_ms = batch_window_ms
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared HTTP client, creating it on first use and again
+        whenever the running event loop changes, since a client is bound to
+        the loop it was created in.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._discard_client()
+            self._client_loop = loop
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=30.0
+            )
+        return self._client
+
+    def _discard_client(self) -> None:
+        """
+        Close the current client on its own loop if that loop is still
+        running; a client on a closed loop can only be dropped.
+        """
+        client, loop = self._client, self._client_loop
+        self._client = None
+        if client is None or client.is_closed or loop is None:
+            return
+        if loop.is_running() and loop is not asyncio.get_running_loop():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release its pooled connections."""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            client, self._client = self._client, None
+            await client.aclose()
+        else:
+            self._discard_client()
+
+    async def _post_batch(
+        self,
+        queries: List[str],
+        k: int,
+        filter_dict: Optional[Dict],
+        score_threshold: float
+    ) -> Dict:
+        """Send several queries to the knowledge base in a single request."""
+        payload = {
+            "queries": queries,
+            "k": k,
+            "filter_dict": filter_dict,
+            "score_threshold": score_threshold
+        }
+        response = await self._get_client().post("/query_batch", content=orjson.dumps(payload))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def _enqueue_query(self, payload: Dict) -> Dict:
+        """Queue a single query for the next batch and wait for its response."""
+        future = asyncio.get_running_loop().create_future()
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+        self._batch_queue.put_nowait((payload, future))
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._drain_batches())
+        return await future
+
+    async def _drain_batches(self) -> None:
+        """Collect queued queries over the batch window and post them together."""
+        while not self._batch_queue.empty():
+            await asyncio.sleep(self.batch_window_ms / 1000)
+            pending = []
+            while not self._batch_queue.empty():
+                pending.append(self._batch_queue.get_nowait())
+
+            # Only queries sharing the same search parameters can be batched
+            groups: Dict[tuple, list] = {}
+            for payload, future in pending:
+                key = (payload["k"], repr(payload["filter_dict"]), payload["score_threshold"])
+                groups.setdefault(key, []).append((payload, future))
+
+            for group in groups.values():
+                first = group[0][0]
+                try:
+                    response_data = await self._post_batch(
+                        [payload["query"] for payload, _ in group],
+                        first["k"],
+                        first["filter_dict"],
+                        first["score_threshold"]
+                    )
+                    batch_results = response_data.get("results", [])
+                    for i, (_, future) in enumerate(group):
+                        if future.done():
+                            continue
+                        # Copy only the fields the server sent, so query() falls
+                        # back to its defaults exactly as for a single /query reply
+                        result = {
+                            key: response_data[key]
+                            for key in ("status", "message")
+                            if key in response_data
+                        }
+                        result["results"] = batch_results[i] if i < len(batch_results) else []
+                        future.set_result(result)
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+    
+    @staticmethod
+    async def _emit_citations(emitter: EventEmitter, results: List[Dict]) -> None:
+        """Emit a citation for every result concurrently."""
+        await asyncio.gather(*(
+            emitter.citation(
+                document=result.get("content", ""),
+                metadata=result.get("metadata", {}),
+                source=result.get("source", "knowledge_base")
+            )
+            for result in results
+        ))
     
     async def query(
         self,
@@ -101,7 +249,6 @@ class Tools:
                 description="Preparing to search knowledge base...",
                 status="in_progress"
             )
-            time.sleep(1)
 
             payload = {
                 "query": query,
@@ -114,16 +261,13 @@ class Tools:
                 description=f"Searching knowledge base for: {query}",
                 status="searching"
             )
-            time.sleep(1)
             
-            response = requests.post(
-                f"{self.base_url}/query",
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            
-            response_data = response.json()
+            if self.batch_window_ms > 0:
+                response_data = await self._enqueue_query(payload)
+            else:
+                response = await self._get_client().post("/query", content=orjson.dumps(payload))
+                response.raise_for_status()
+                response_data = orjson.loads(response.content)
             results = response_data.get("results", [])
             
             if response_data["status"] == "success":
@@ -133,14 +277,8 @@ class Tools:
                         status="success",
                         done=True
                     )
-                    time.sleep(1)
                     # Emit each result as a citation
-                    for result in results:
-                        await emitter.citation(
-                            document=result.get("content", ""),
-                            metadata=result.get("metadata", {}),
-                            source=result.get("source", "knowledge_base")
-                        )
+                    await self._emit_citations(emitter, results)
                 else:
                     await emitter.status(
                         description=response_data.get("message", "No relevant documents found"),
@@ -160,4 +298,53 @@ class Tools:
             error_msg = f"Error querying knowledge base: {str(e)}"
             logger.error(error_msg)
             await emitter.fail(description=error_msg)
-            return []
\ No newline at end of file
+            return []
+
+    async def query_batch(
+        self,
+        queries: List[str],
+        k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        score_threshold: float = 0.3,
+        __event_emitter__: Optional[Callable[[dict], Any]] = None
+    ) -> List[List[Dict]]:
+        """
+        Query the knowledge base for several queries in a single request.
+        
+        :param queries: The query texts
+        """
+        emitter = EventEmitter(__event_emitter__)
+        
+        try:
+            await emitter.status(
+                description=f"Searching knowledge base for {len(queries)} queries",
+                status="searching"
+            )
+            
+            response_data = await self._post_batch(queries, k, filter_dict, score_threshold)
+            batch_results = response_data.get("results", [])
+            
+            if response_data["status"] == "success":
+                total = sum(len(results) for results in batch_results)
+                await emitter.status(
+                    description=f"Found {total} relevant documents",
+                    status="success" if total else "no_results",
+                    done=True
+                )
+                await self._emit_citations(
+                    emitter, [result for results in batch_results for result in results]
+                )
+            else:
+                await emitter.status(
+                    description=response_data.get("message", "Query failed"),
+                    status="error",
+                    done=True
+                )
+            
+            return batch_results
+            
+        except Exception as e:
+            error_msg = f"Error querying knowledge base: {str(e)}"
+            logger.error(error_msg)
+            await emitter.fail(description=error_msg)
+            return [[] for _ in queries]